@@ -1,16 +1,45 @@
 # bot.py
 import os
 import json
+import time
 import asyncio
+import bisect
+import threading
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+_STARTUP_T0 = time.perf_counter()  # stdlib imports above are negligible; discord's below are timed
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 
-import gspread
-from google.oauth2.service_account import Credentials
+if TYPE_CHECKING:
+    import gspread  # imported lazily at runtime, see make_gspread_client()
+
+# ================= Startup timing =================
+startup_timings: dict[str, float] = {}  # phase -> seconds, in the order they finished
+_phase_start = _STARTUP_T0
+
+def mark_phase(name: str):
+    """Close a sequential startup phase (time since the previous mark)."""
+    global _phase_start
+    now = time.perf_counter()
+    startup_timings[name] = now - _phase_start
+    _phase_start = now
+
+def record_phase(name: str, seconds: float):
+    """Record a phase that ran concurrently with the others."""
+    startup_timings[name] = seconds
+
+def print_startup_report(title: str):
+    print(f"Startup timings ({title}):")
+    for name, secs in startup_timings.items():
+        print(f"  {name:<20} {secs * 1000:8.0f} ms")
+    print(f"  {'since process start':<20} {(time.perf_counter() - _STARTUP_T0) * 1000:8.0f} ms")
+
+mark_phase("imports")
 
 # ================= Env & config =================
 load_dotenv()
@@ -22,6 +51,9 @@ WORKSHEET_NAME = os.getenv("GOOGLE_WORKSHEET_NAME", "Sheet1")  # your tab name
 SA_JSON_INLINE = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON_INLINE")
 SA_JSON_PATH = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON_PATH")    # optional alternative
 
+# Fast startup: pre-warm Sheets while the gateway connects and sync commands in the background
+FAST_STARTUP = os.getenv("FAST_STARTUP", "0").lower() in ("1", "true", "yes")
+
 if not DISCORD_BOT_TOKEN:
     raise RuntimeError("Missing DISCORD_BOT_TOKEN environment variable.")
 
@@ -35,13 +67,19 @@ tree = bot.tree  # use the bot's built-in CommandTree
 # A simple write lock for Sheets operations
 write_lock = asyncio.Lock()
 
+mark_phase("config")
+
 # ================= Google Sheets helpers =================
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive",
 ]
 
-def make_gspread_client() -> gspread.Client:
+def make_gspread_client() -> "gspread.Client":
+    # Heavy imports deferred until Sheets is first needed
+    import gspread
+    from google.oauth2.service_account import Credentials
+
     if SA_JSON_INLINE:
         info = json.loads(SA_JSON_INLINE)
         creds = Credentials.from_service_account_info(info, scopes=SCOPES)
@@ -54,9 +92,22 @@ def make_gspread_client() -> gspread.Client:
         )
     return gspread.authorize(creds)
 
+# Authorized client + opened spreadsheet, shared by every call (token refresh is handled by gspread)
+_gc = None
+_sh = None
+_client_lock = threading.Lock()  # callers run in worker threads via asyncio.to_thread
+
+def get_spreadsheet():
+    global _gc, _sh
+    with _client_lock:
+        if _sh is None:
+            gc = make_gspread_client()
+            _sh = gc.open_by_key(SPREADSHEET_ID)
+            _gc = gc
+        return _gc, _sh
+
 def open_sheet(worksheet_name: str | None = None):
-    gc = make_gspread_client()
-    sh = gc.open_by_key(SPREADSHEET_ID)
+    gc, sh = get_spreadsheet()
     ws = sh.worksheet(worksheet_name or WORKSHEET_NAME)
     return gc, sh, ws
 
@@ -68,39 +119,201 @@ def safe_set_cell(a1: str, value: str | int | float, worksheet_name: str | None
     _, _, ws = open_sheet(worksheet_name)
     ws.update_acell(a1, value)
 
+# ================= Autocomplete index =================
+AUTOCOMPLETE_LIMIT = 25     # Discord's max choices per autocomplete reply
+CHOICE_MAX_LEN = 100        # Discord's max length for a choice name/value
+SEED_RETRY_MAX = 300        # seconds; cap for the startup seed's exponential backoff
+
+class PrefixIndex:
+    """Case-insensitive prefix index over a sorted array (no Sheets calls on lookup)."""
+
+    def __init__(self):
+        self._keys: list[tuple[str, str]] = []  # sorted (casefolded, original)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, value) -> None:
+        value = str(value).strip()
+        if not value or len(value) > CHOICE_MAX_LEN:
+            return
+        key = (value.casefold(), value)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return
+        self._keys.insert(i, key)
+
+    def merge(self, values) -> None:
+        """Union a batch of values into the index (keeps anything added meanwhile)."""
+        keys = set(self._keys)
+        for v in values:
+            v = str(v).strip()
+            if v and len(v) <= CHOICE_MAX_LEN:
+                keys.add((v.casefold(), v))
+        self._keys = sorted(keys)
+
+    def search(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+        p = prefix.strip().casefold()
+        out = []
+        for i in range(bisect.bisect_left(self._keys, (p, "")), len(self._keys)):
+            folded, original = self._keys[i]
+            if not folded.startswith(p) or len(out) >= limit:
+                break
+            out.append(original)
+        return out
+
+usernames_index = PrefixIndex()
+categories_index = PrefixIndex()
+worksheets_index = PrefixIndex()
+
+def fetch_autocomplete_seed() -> tuple[list[str], list[str], list[str]]:
+    """Read worksheet titles plus username/category (B2:C, header row skipped) of every tab in one batch."""
+    _, sh = get_spreadsheet()
+    titles = [ws.title for ws in sh.worksheets()]
+    ranges = ["'{}'!B2:C".format(t.replace("'", "''")) for t in titles]
+    resp = sh.values_batch_get(ranges) if ranges else {}
+
+    usernames, categories = [], []
+    for vr in resp.get("valueRanges", []):
+        for row in vr.get("values", []):
+            if len(row) > 0:
+                usernames.append(row[0])
+            if len(row) > 1:
+                categories.append(row[1])
+    return usernames, categories, titles
+
+async def build_autocomplete_index(phase: str):
+    """Seed the index. This is also the Sheets warm-up: lazy imports, credentials, token, open sheet."""
+    t = time.perf_counter()
+    delay = 5
+    while True:
+        try:
+            usernames, categories, titles = await asyncio.to_thread(fetch_autocomplete_seed)
+            break
+        except Exception as e:
+            print(f"Autocomplete index build failed, retrying in {delay}s: {e}")
+        finally:
+            # Timing covers the first attempt only; retries are not part of startup
+            if phase not in startup_timings:
+                record_phase(phase, time.perf_counter() - t)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, SEED_RETRY_MAX)
+    usernames_index.merge(usernames)
+    categories_index.merge(categories)
+    worksheets_index.merge(titles)
+    print(f"Autocomplete index ready: {len(usernames_index)} users, "
+          f"{len(categories_index)} categories, {len(worksheets_index)} worksheets")
+
+def remember_write(username: str | None = None, category: str | None = None, worksheet: str | None = None):
+    """Fold a successful write into the autocomplete index."""
+    if username:
+        usernames_index.add(username)
+    if category:
+        categories_index.add(category)
+    if worksheet:
+        worksheets_index.add(worksheet)
+
+def _choices(index: PrefixIndex, current: str) -> list[app_commands.Choice[str]]:
+    return [app_commands.Choice(name=v, value=v) for v in index.search(current)]
+
+async def username_autocomplete(interaction: discord.Interaction, current: str):
+    return _choices(usernames_index, current)
+
+async def category_autocomplete(interaction: discord.Interaction, current: str):
+    return _choices(categories_index, current)
+
+async def worksheet_autocomplete(interaction: discord.Interaction, current: str):
+    return _choices(worksheets_index, current)
+
 # ================= Startup & sync =================
+autocomplete_task: asyncio.Task | None = None
+sync_task: asyncio.Task | None = None
+
 @bot.event
 async def setup_hook():
+    mark_phase("login")
+
+    # Fast mode: warm Sheets (and seed autocomplete) alongside the gateway connect
+    global autocomplete_task
+    if FAST_STARTUP:
+        autocomplete_task = asyncio.create_task(build_autocomplete_index("sheets prewarm"))
+
     # Load the duel system cog BEFORE first sync
     try:
         await bot.load_extension("duel_royale")
         print("Loaded duel_royale cog ✅")
     except Exception as e:
         print(f"Failed loading duel_royale: {e}")
+    mark_phase("load cogs")
 
-@bot.event
-async def on_ready():
+async def sync_commands(concurrent: bool = False):
+    t = time.perf_counter()
     try:
         print("Registered commands in code:", [c.name for c in tree.get_commands()])
-        total = 0
-        for g in bot.guilds:
-            gobj = discord.Object(id=g.id)
-            synced = await tree.sync(guild=gobj)
-            print(f"Synced {len(synced)} commands to guild {g.name} ({g.id})")
-            total += len(synced)
-
-        synced_global = await tree.sync()
+        if concurrent:
+            guilds = list(bot.guilds)
+            results = await asyncio.gather(
+                *(tree.sync(guild=discord.Object(id=g.id)) for g in guilds), tree.sync(),
+                return_exceptions=True,
+            )
+            for g, synced in zip(guilds, results):
+                if isinstance(synced, Exception):
+                    print(f"Sync to guild {g.name} ({g.id}) failed: {synced}")
+                else:
+                    print(f"Synced {len(synced)} commands to guild {g.name} ({g.id})")
+            synced_global = results[-1]
+            if isinstance(synced_global, Exception):
+                raise synced_global
+        else:
+            for g in bot.guilds:
+                gobj = discord.Object(id=g.id)
+                synced = await tree.sync(guild=gobj)
+                print(f"Synced {len(synced)} commands to guild {g.name} ({g.id})")
+            synced_global = await tree.sync()
         print(f"Synced {len(synced_global)} commands globally")
-
-        print(f"Logged in as {bot.user} (ID: {bot.user.id})")
     except Exception as e:
         print("Command sync failed:", e)
+    record_phase("command sync", time.perf_counter() - t)
+
+@bot.event
+async def on_ready():
+    global sync_task, autocomplete_task
+    if sync_task is not None:
+        # READY again after a session that couldn't resume: already synced and reported
+        print(f"Reconnected as {bot.user} (ID: {bot.user.id})")
+        return
+    mark_phase("gateway connect")
+
+    if FAST_STARTUP:
+        # Commands registered by the previous run are still live, so serve right away
+        # and sync once per process in the background
+        sync_task = asyncio.create_task(sync_commands(concurrent=True))
+        print(f"Logged in as {bot.user} (ID: {bot.user.id})")
+        print_startup_report("ready")
+        return
+
+    sync_task = asyncio.create_task(sync_commands())
+    await sync_task
+    print(f"Logged in as {bot.user} (ID: {bot.user.id})")
+    print_startup_report("ready")
+
+    # Default mode keeps Sheets off the startup path; warm it up once the bot is serving
+    if autocomplete_task is None:
+        autocomplete_task = asyncio.create_task(build_autocomplete_index("sheets warm-up (after ready)"))
+
+@bot.listen("on_interaction")
+async def _first_interaction(interaction: discord.Interaction):
+    # Autocomplete lookups aren't served commands; wait for a real one
+    if interaction.type == discord.InteractionType.autocomplete or "first interaction" in startup_timings:
+        return
+    record_phase("first interaction", time.perf_counter() - _STARTUP_T0)
+    print_startup_report("first interaction")
 # ================= Bot health commands =================
 @tree.command(name="status", description="Check bot → Google Sheets connectivity.")
 async def status(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     try:
-        _, _, ws = open_sheet()
+        _, _, ws = await asyncio.to_thread(open_sheet)
         await interaction.followup.send(f"✅ Connected to **{ws.spreadsheet.title}** / **{ws.title}**.", ephemeral=True)
     except Exception as e:
         await interaction.followup.send(f"❌ Sheets error: `{e}`", ephemeral=True)
@@ -112,6 +325,7 @@ async def ping(interaction: discord.Interaction):
 # ================= Sheets commands =================
 @tree.command(name="append", description="Append a row: date, user, category.")
 @app_commands.describe(username="Name to log", category="Category to log", worksheet="Optional worksheet/tab")
+@app_commands.autocomplete(username=username_autocomplete, category=category_autocomplete, worksheet=worksheet_autocomplete)
 async def append(interaction: discord.Interaction, username: str, category: str, worksheet: str | None = None):
     await interaction.response.defer(ephemeral=True)
     date_str = datetime.now().strftime("%m/%d/%Y")
@@ -119,6 +333,7 @@ async def append(interaction: discord.Interaction, username: str, category: str,
     async with write_lock:
         try:
             await asyncio.to_thread(safe_append_row, values, worksheet)
+            remember_write(username, category, worksheet)
             await interaction.followup.send(f"📝 Logged **{username}** → **{category}**.", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ Append failed: `{e}`", ephemeral=True)
@@ -126,6 +341,7 @@ async def append(interaction: discord.Interaction, username: str, category: str,
 @tree.command(name="loguser", description="(Admins) Log a user to a category you pick.")
 @app_commands.default_permissions(administrator=True)
 @app_commands.describe(username="User to log", category="Category", worksheet="Optional worksheet/tab")
+@app_commands.autocomplete(username=username_autocomplete, category=category_autocomplete, worksheet=worksheet_autocomplete)
 async def loguser(interaction: discord.Interaction, username: str, category: str, worksheet: str | None = None):
     await interaction.response.defer(ephemeral=True)
     date_str = datetime.now().strftime("%m/%d/%Y")
@@ -133,6 +349,7 @@ async def loguser(interaction: discord.Interaction, username: str, category: str
     async with write_lock:
         try:
             await asyncio.to_thread(safe_append_row, values, worksheet)
+            remember_write(username, category, worksheet)
             await interaction.followup.send(f"✅ Logged **{username}** → **{category}**.", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ `{e}`", ephemeral=True)
@@ -140,6 +357,7 @@ async def loguser(interaction: discord.Interaction, username: str, category: str
 @tree.command(name="loguser_text", description="(Admins) Log a category for a name you type.")
 @app_commands.default_permissions(administrator=True)
 @app_commands.describe(username="Name to record (free text)", category="Category to log", worksheet="Optional worksheet/tab")
+@app_commands.autocomplete(username=username_autocomplete, category=category_autocomplete, worksheet=worksheet_autocomplete)
 async def loguser_text(interaction: discord.Interaction, username: str, category: str, worksheet: str | None = None):
     await interaction.response.defer(ephemeral=True)
     date_str = datetime.now().strftime("%m/%d/%Y")
@@ -147,17 +365,20 @@ async def loguser_text(interaction: discord.Interaction, username: str, category
     async with write_lock:
         try:
             await asyncio.to_thread(safe_append_row, values, worksheet)
+            remember_write(username, category, worksheet)
             await interaction.followup.send(f"🗂️ Logged **{username}** → **{category}**.", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ `{e}`", ephemeral=True)
 
 @tree.command(name="setcell", description="Set a single cell (A1) to a value.")
 @app_commands.describe(a1="Cell (e.g., B2)", value="Value to write", worksheet="Optional worksheet/tab")
+@app_commands.autocomplete(worksheet=worksheet_autocomplete)
 async def setcell(interaction: discord.Interaction, a1: str, value: str, worksheet: str | None = None):
     await interaction.response.defer(ephemeral=True)
     async with write_lock:
         try:
             await asyncio.to_thread(safe_set_cell, a1, value, worksheet)
+            remember_write(worksheet=worksheet)
             await interaction.followup.send(f"✅ Set **{a1}** → `{value}`.", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ `{e}`", ephemeral=True)
@@ -200,17 +200,17 @@ class DuelRoyale(commands.Cog):
         hp = {p1.id: START_HP, p2.id: START_HP}
         next_multiplier = {}
 
-        await followup.send(f"⚔️ **Duel begins!** {names[p1.id]} vs {names[p2.id]}")
-        await followup.send(f"Both fighters start at {START_HP} HP.")
-
         bot_id = self.bot.user.id
         attacker, defender = p1.id, p2.id
         round_no = 1
 
-        # lock participants
+        # lock participants (before the first await, so nobody can grab them mid-setup)
         self.active_players.add(p1.id)
         self.active_players.add(p2.id)
         try:
+            await followup.send(f"⚔️ **Duel begins!** {names[p1.id]} vs {names[p2.id]}")
+            await followup.send(f"Both fighters start at {START_HP} HP.")
+
             while hp[attacker] > 0 and hp[defender] > 0:
                 # Bot-only GOD SMITE
                 if attacker == bot_id:
@@ -347,8 +347,8 @@ class DuelRoyale(commands.Cog):
             if self.pending_by_challenger.get(challenger_id) == target.id:
                 self.pending_by_challenger.pop(challenger_id, None)
             return await interaction.response.send_message("The challenge is no longer valid.", ephemeral=True)
-        if self._is_busy(target.id):
-            # (Shouldn’t happen since we're looking at their own pending, but be safe)
+        if target.id in self.active_players or target.id in self.pending_by_challenger:
+            # Their own incoming request is expected here; only a fight or an outgoing request blocks
             return await interaction.response.send_message("You’re currently busy.", ephemeral=True)
 
         challenger = interaction.guild.get_member(challenger_id)
@@ -357,11 +357,18 @@ class DuelRoyale(commands.Cog):
             self.pending_by_challenger.pop(challenger_id, None)
             return await interaction.response.send_message("Challenger is no longer here.", ephemeral=True)
 
-        # Clear pending, start duel runtime
+        # Clear pending and lock both players in the same step, so they're never briefly free
         self.pending_by_target.pop(target.id, None)
         self.pending_by_challenger.pop(challenger_id, None)
+        self.active_players.add(challenger_id)
+        self.active_players.add(target.id)
 
-        await interaction.response.defer(thinking=False)
+        try:
+            await interaction.response.defer(thinking=False)
+        except Exception:
+            self.active_players.discard(challenger_id)
+            self.active_players.discard(target.id)
+            raise
         await self._start_duel_runtime(interaction, challenger, target)
 
     # -------- /duel_decline --------
@@ -423,7 +430,6 @@ class DuelRoyale(commands.Cog):
                 ephemeral=True
             )
 
-        await interaction.response.defer(thinking=False)
         followup = interaction.followup
 
         names = {m.id: m.display_name for m in roster}
@@ -431,20 +437,21 @@ class DuelRoyale(commands.Cog):
         alive = [m.id for m in roster]
         next_multiplier = {}
 
-        await self.narrate(followup, [
-            f"👑 **Battle Royale begins!** ({len(roster)} players)",
-            ", ".join(f"**{m.display_name}**" for m in roster),
-            f"All start at {START_HP} HP. Last one standing wins!"
-        ])
+        round_no = 1
+        def fmt(name, pid): return fmt_hp(name, hp[pid])
 
-        # lock everyone for the duration of the Royale
+        # lock everyone for the duration of the Royale (before the first await, so the busy check holds)
         for m in roster:
             self.active_players.add(m.id)
 
-        round_no = 1
-        def fmt(name, pid): return fmt_hp(name, hp[pid])
-
         try:
+            await interaction.response.defer(thinking=False)
+            await self.narrate(followup, [
+                f"👑 **Battle Royale begins!** ({len(roster)} players)",
+                ", ".join(f"**{m.display_name}**" for m in roster),
+                f"All start at {START_HP} HP. Last one standing wins!"
+            ])
+
             while len(alive) > 1:
                 await followup.send(f"— **Round {round_no}** —")
                 random.shuffle(alive)
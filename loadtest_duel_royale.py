@@ -0,0 +1,426 @@
+# loadtest_duel_royale.py
+# Load-test harness for the DuelRoyale cog. No Discord connection needed:
+# interactions/webhooks are faked and asyncio.sleep runs on a virtual clock.
+#
+#   python loadtest_duel_royale.py --duels 2000 --royales 500 --races 5000 --rate-limit 0.01
+import argparse
+import asyncio
+import heapq
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from unittest import mock
+
+import discord
+
+import duel_royale
+from duel_royale import DuelRoyale
+
+_real_sleep = asyncio.sleep
+
+# ================= Virtual clock =================
+class VirtualClock:
+    """Replaces asyncio.sleep/time.time. Sleepers wake in time order without real waiting."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._timers: list[tuple[float, int, asyncio.Future]] = []
+        self._seq = 0
+        self.on_advance = None  # optional callback, run each time the clock moves
+
+    async def sleep(self, delay, result=None):
+        if delay <= 0:
+            await _real_sleep(0)
+            return result
+        fut = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._timers, (self.now + delay, self._seq, fut))
+        await fut
+        return result
+
+    def time(self) -> float:
+        return self.now
+
+    async def drive(self, done: asyncio.Event):
+        """Advance to the next timer whenever the loop has had a chance to settle."""
+        while not done.is_set():
+            await _real_sleep(0)
+            if not self._timers:
+                continue
+            when = self._timers[0][0]
+            self.now = when
+            if self.on_advance:
+                self.on_advance()
+            while self._timers and self._timers[0][0] == when:
+                _, _, fut = heapq.heappop(self._timers)
+                if not fut.done():
+                    fut.set_result(None)
+
+# ================= Fake Discord objects =================
+class FakeHTTPResponse:
+    """Just enough of aiohttp.ClientResponse for discord.HTTPException."""
+    status = 429
+    reason = "Too Many Requests"
+
+class Stats:
+    def __init__(self):
+        self.messages = 0
+        self.rate_limited = 0
+        self.send_failures = 0
+
+class FakeTransport:
+    """Send-side behaviour shared by all fakes: latency, 429s and discord.py-style retries."""
+
+    def __init__(self, stats: Stats, latency: float, jitter: float, rate_limit: float,
+                 retry_after: float, max_retries: int):
+        self.stats = stats
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.max_retries = max_retries
+
+    async def send(self):
+        for _ in range(self.max_retries + 1):
+            if self.latency or self.jitter:
+                await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+            if random.random() >= self.rate_limit:
+                self.stats.messages += 1
+                return
+            self.stats.rate_limited += 1
+            await asyncio.sleep(self.retry_after)
+        self.stats.send_failures += 1
+        raise discord.HTTPException(FakeHTTPResponse(), "You are being rate limited.")
+
+class FakeMember:
+    def __init__(self, user_id: int, bot: bool = False):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = bot
+
+class FakeGuild:
+    def __init__(self, guild_id: int, members: dict[int, FakeMember]):
+        self.id = guild_id
+        self._members = members
+
+    def get_member(self, user_id: int):
+        return self._members.get(user_id)
+
+class FakeBot:
+    def __init__(self, user: FakeMember):
+        self.user = user
+
+class FakeWebhook:
+    def __init__(self, transport: FakeTransport, on_first_send=None):
+        self.transport = transport
+        self.sent = 0
+        self._on_first_send = on_first_send
+
+    async def send(self, content=None, *, embed=None, allowed_mentions=None, ephemeral=False):
+        if self.sent == 0 and self._on_first_send:
+            self._on_first_send()
+        await self.transport.send()
+        self.sent += 1
+
+class FakeInteractionResponse:
+    def __init__(self, transport: FakeTransport):
+        self.transport = transport
+        self.deferred = False
+        self.ephemeral = False
+        self.content = None
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content=None, *, embed=None, ephemeral=False, allowed_mentions=None):
+        self._done = True
+        self.ephemeral = ephemeral
+        self.content = content
+        await self.transport.send()
+
+    async def defer(self, *, ephemeral=False, thinking=False):
+        self._done = True
+        self.deferred = True
+        await self.transport.send()
+
+class FakeInteraction:
+    def __init__(self, user: FakeMember, guild: FakeGuild, channel_id: int, transport: FakeTransport,
+                 on_first_send=None):
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id
+        self.channel_id = channel_id
+        self.response = FakeInteractionResponse(transport)
+        self.followup = FakeWebhook(transport, on_first_send)
+
+# ================= Harness =================
+class Harness:
+    def __init__(self, args):
+        self.args = args
+        self.clock = VirtualClock()
+        self.stats = Stats()
+        self.transport = FakeTransport(self.stats, args.latency, args.jitter, args.rate_limit,
+                                       args.retry_after, args.max_retries)
+
+        n_users = max(args.users, 2 * args.duels + args.royale_size * args.royales + args.race_pool)
+        self.members = {uid: FakeMember(uid) for uid in range(1, n_users + 1)}
+        bot_user = FakeMember(n_users + 1, bot=True)
+        self.members[bot_user.id] = bot_user
+        self.guild = FakeGuild(1, self.members)
+        self.cog = DuelRoyale(FakeBot(bot_user))
+
+        # Bookkeeping outside the cog, used to catch busy-state violations
+        self.fighting: dict[int, int] = {}
+        self.violations = 0
+        self.active_fights = 0
+        self.peak_active_fights = 0
+        self.peak_mem = 0
+        self.completed = 0
+        self.errors = 0
+        self.fight_messages: list[int] = []
+        self.fight_durations: list[float] = []
+        self.outcomes: dict[str, Counter] = {op: Counter() for op in ("challenge", "accept", "decline", "royale")}
+        self.duel_fights_expected = 0  # accepts on disjoint users whose challenge went through
+        self.duel_fights_started = 0
+
+    def _interaction(self, user_id: int, roster: list[int] | None = None, channel_id: int = 1):
+        state = {}
+
+        def on_first_send():
+            # First followup message == the fight has started
+            if roster is None or state:
+                return
+            state['start'] = self.clock.now
+            state['roster'] = roster
+            self.active_fights += 1
+            self.peak_active_fights = max(self.peak_active_fights, self.active_fights)
+            for uid in roster:
+                if self.fighting.get(uid):
+                    self.violations += 1
+                self.fighting[uid] = self.fighting.get(uid, 0) + 1
+
+        inter = FakeInteraction(self.members[user_id], self.guild, channel_id, self.transport, on_first_send)
+        return inter, state
+
+    def _finish(self, inter: FakeInteraction, state: dict):
+        if not state:
+            return
+        self.active_fights -= 1
+        for uid in state['roster']:
+            self.fighting[uid] -= 1
+        self.completed += 1
+        self.fight_messages.append(inter.followup.sent)
+        self.fight_durations.append(self.clock.now - state['start'])
+
+    async def _call(self, op: str, command, inter, state: dict, *args) -> str:
+        """Run a command callback and classify what it did."""
+        try:
+            await command.callback(self.cog, inter, *args)
+            failed = False
+        except discord.HTTPException:
+            self.errors += 1
+            failed = True
+        finally:
+            self._finish(inter, state)
+
+        if state:
+            outcome = "started"
+        elif failed:
+            outcome = "http error"
+        elif inter.response.content and inter.response.ephemeral:
+            # Refusal text, with user names folded so identical refusals group together
+            outcome = re.sub(r"user\d+", "<user>", inter.response.content)[:70]
+        else:
+            outcome = "ok"
+        self.outcomes[op][outcome] += 1
+        return outcome
+
+    # ----- Flows -----
+    async def challenge(self, a: int, b: int) -> str:
+        inter, state = self._interaction(a)
+        return await self._call("challenge", self.cog.duel, inter, state, self.members[b])
+
+    async def accept(self, a: int, b: int) -> str:
+        inter, state = self._interaction(b, roster=[a, b])
+        return await self._call("accept", self.cog.duel_accept, inter, state)
+
+    async def decline(self, b: int) -> str:
+        inter, state = self._interaction(b)
+        return await self._call("decline", self.cog.duel_decline, inter, state)
+
+    async def royale(self, roster: list[int]) -> str:
+        players = [self.members[uid] for uid in roster[1:8]]
+        players += [None] * (7 - len(players))
+        inter, state = self._interaction(roster[0], roster=list(dict.fromkeys(roster[:8])))
+        return await self._call("royale", self.cog.royale, inter, state, *players)
+
+    async def duel_flow(self, a: int, b: int, accept: bool):
+        sent = await self.challenge(a, b)
+        await asyncio.sleep(random.uniform(0, 5))
+        if accept:
+            outcome = await self.accept(a, b)
+            # Users are disjoint here, so every delivered challenge must turn into a fight
+            if sent == "ok" and outcome != "http error":
+                self.duel_fights_expected += 1
+                if outcome == "started":
+                    self.duel_fights_started += 1
+        else:
+            await self.decline(b)
+
+    async def race_flow(self, pool: list[int]):
+        """Random op against a small shared pool of users, so busy checks actually collide."""
+        op = random.random()
+        await asyncio.sleep(random.uniform(0, 30))
+        if op < 0.35:
+            a, b = random.sample(pool, 2)
+            await self.challenge(a, b)
+        elif op < 0.65:
+            b = random.choice(pool)
+            data = self.cog.pending_by_target.get(b)
+            await self.accept(data['challenger'] if data else b, b)
+        elif op < 0.80:
+            await self.decline(random.choice(pool))
+        else:
+            await self.royale(random.sample(pool, random.randint(2, min(len(pool), 8))))
+
+    # ----- Run -----
+    def _fight_memory(self) -> int:
+        """Bytes currently held by allocations made in duel_royale.py (excludes harness/flow overhead)."""
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, duel_royale.__file__)])
+        return sum(stat.size for stat in snapshot.statistics("filename"))
+
+    def _sample_memory(self):
+        # Snapshots are slow, so only re-measure once concurrency has grown by ~10%
+        if self.active_fights > max(self.mem_fights_at_peak * 1.1, self.mem_fights_at_peak + 1):
+            self.peak_mem = self._fight_memory()
+            self.mem_fights_at_peak = self.active_fights
+
+    async def run(self):
+        args = self.args
+        uids = [uid for uid, m in self.members.items() if not m.bot]
+        random.shuffle(uids)
+
+        self.mem_fights_at_peak = 0
+        if args.memory:
+            tracemalloc.start()
+
+        flows = []
+        it = iter(uids)
+        for i in range(args.duels):
+            flows.append(self.duel_flow(next(it), next(it), accept=(i % 4 != 0)))  # 1 in 4 declined
+        for _ in range(args.royales):
+            flows.append(self.royale([next(it) for _ in range(args.royale_size)]))
+        pool = list(it)[:args.race_pool]  # only users the disjoint flows never took
+        for _ in range(args.races):
+            flows.append(self.race_flow(pool))
+
+        baseline = 0
+        if args.memory:
+            baseline = self._fight_memory()
+            self.clock.on_advance = self._sample_memory
+
+        done = asyncio.Event()
+        driver = asyncio.create_task(self.clock.drive(done))
+        wall_start = time.perf_counter()
+        await asyncio.gather(*flows)
+        wall = time.perf_counter() - wall_start
+        done.set()
+        await driver
+        if args.memory:
+            tracemalloc.stop()
+
+        return self.report(wall, baseline)
+
+    def _leftover_state(self) -> list[str]:
+        cog = self.cog
+        problems = []
+        if cog.active_players:
+            problems.append(f"{len(cog.active_players)} users still in active_players")
+        for target, data in cog.pending_by_target.items():
+            if cog.pending_by_challenger.get(data['challenger']) != target:
+                problems.append(f"pending_by_target[{target}] has no matching pending_by_challenger entry")
+        for challenger, target in cog.pending_by_challenger.items():
+            data = cog.pending_by_target.get(target)
+            if not data or data['challenger'] != challenger:
+                problems.append(f"pending_by_challenger[{challenger}] has no matching pending_by_target entry")
+        if cog.pending_by_target or cog.pending_by_challenger:
+            expired = sum(1 for data in cog.pending_by_target.values() if data['expires'] <= self.clock.now)
+            problems.append(f"{len(cog.pending_by_target)} pending challenges left "
+                            f"({expired} already expired, {len(cog.pending_by_challenger)} by challenger)")
+        return problems
+
+    def report(self, wall: float, baseline: int):
+        msgs = self.fight_messages or [0]
+        durs = sorted(self.fight_durations) or [0.0]
+        per_fight = (self.peak_mem - baseline) / self.mem_fights_at_peak if self.mem_fights_at_peak else 0
+        leftover = self._leftover_state()
+
+        print("=== DuelRoyale load test ===")
+        print(f"Flows: {self.args.duels} duels, {self.args.royales} royales, {self.args.races} race ops "
+              f"(pool of {self.args.race_pool})")
+        print(f"Fights run:            {self.completed}  (peak {self.peak_active_fights} concurrent)")
+        print(f"Wall time:             {wall:.2f}s  → {self.completed / wall if wall else 0:.1f} fights/s")
+        print(f"Virtual time:          {self.clock.now:.1f}s")
+        print(f"Fight length (virtual): p50 {durs[len(durs) // 2]:.1f}s, p95 {durs[int(len(durs) * 0.95)]:.1f}s")
+        print(f"Messages per fight:    mean {statistics.mean(msgs):.1f}, max {max(msgs)}")
+        print(f"Messages sent total:   {self.stats.messages}")
+        print(f"429s injected:         {self.stats.rate_limited}  (gave up after retries: {self.stats.send_failures})")
+        print(f"Flows aborted by HTTP errors: {self.errors}")
+        if self.args.memory and not self.mem_fights_at_peak:
+            print("Memory per active fight: n/a (no fight started)")
+        elif self.args.memory:
+            print(f"Memory per active fight: ~{per_fight / 1024:.1f} KiB  (at {self.mem_fights_at_peak} concurrent fights)")
+        print(f"Busy-state violations (user in two fights at once): {self.violations}")
+        print("Leftover state:        " + ("; ".join(leftover) if leftover else "clean"))
+        print("Outcomes:")
+        for op, counts in self.outcomes.items():
+            for outcome, n in counts.most_common():
+                print(f"  {op:<10} {n:>7}  {outcome}")
+
+        ok = True
+        if self.duel_fights_started < self.duel_fights_expected:
+            print(f"FAIL: only {self.duel_fights_started} of {self.duel_fights_expected} accepted duels started a fight")
+            ok = False
+        else:
+            print(f"Accepted duels started: {self.duel_fights_started}/{self.duel_fights_expected}")
+        if self.violations:
+            print(f"FAIL: {self.violations} busy-state violations (a user was in two fights at once)")
+            ok = False
+        return ok
+
+def main():
+    ap = argparse.ArgumentParser(description="Load-test the DuelRoyale cog with fake interactions and virtual time.")
+    ap.add_argument("--duels", type=int, default=1000, help="challenge→accept/decline flows on disjoint users")
+    ap.add_argument("--royales", type=int, default=250, help="royales on disjoint users")
+    ap.add_argument("--royale-size", type=int, default=6, help="players per royale (2-8)")
+    ap.add_argument("--races", type=int, default=2000, help="random ops against a small shared user pool")
+    ap.add_argument("--race-pool", type=int, default=20, help="users in the shared race pool")
+    ap.add_argument("--users", type=int, default=0, help="minimum number of fake users")
+    ap.add_argument("--latency", type=float, default=0.05, help="virtual seconds per send")
+    ap.add_argument("--jitter", type=float, default=0.05, help="extra random virtual latency per send")
+    ap.add_argument("--rate-limit", type=float, default=0.0, help="probability a send gets a 429")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="virtual seconds to wait after a 429")
+    ap.add_argument("--max-retries", type=int, default=5, help="retries before a 429 is raised (discord.py uses 5)")
+    ap.add_argument("--no-memory", dest="memory", action="store_false",
+                    help="skip tracemalloc (it slows the run; use for fights/s numbers)")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    args.royale_size = max(2, min(8, args.royale_size))
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    harness = Harness(args)
+    with mock.patch.object(asyncio, "sleep", harness.clock.sleep), \
+         mock.patch.object(duel_royale.time, "time", harness.clock.time):
+        ok = asyncio.run(harness.run())
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()